@@ -2,52 +2,120 @@ import fnmatch
 import logging
 import multiprocessing as mp
 import os
-from collections.abc import Iterable
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from contextlib import ExitStack
 from pathlib import Path
 
 import click
 
-from .pyscry import process_files
+from .pyscry import PKG_MAP, PoolProtocol, _worker_init, process_files
 
 logger = logging.getLogger(__name__)
 
+# Below this many files, a process pool's spawn and pickling overhead costs
+# more than the parsing itself; use threads instead.
+PROCESS_POOL_THRESHOLD = 500
 
-def collect_py_files(paths: list[Path], excludes: Iterable[str] | None = None) -> list[Path]:
+
+def _walk(root: str, exclude_re: re.Pattern[str] | None) -> Iterator[str]:
+    """
+    Yield the paths of all ``.py`` files under `root`.
+
+    Directories whose name matches an exclude pattern are pruned without
+    being descended into, so excluded subtrees cost nothing to skip.
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        logger.warning(f"Error scanning {root}: {e}")
+        return
+
+    with entries:
+        for entry in entries:
+            if exclude_re is not None and exclude_re.match(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path, exclude_re)
+            elif entry.name.endswith(".py"):
+                yield entry.path
+
+
+def _default_cache_file() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "pyscry" / "imports.json"
+
+
+def _walk_all(root: str, exclude_re: re.Pattern[str] | None) -> list[str]:
+    return list(_walk(root, exclude_re))
+
+
+def collect_py_files(paths: list[Path], excludes: Iterable[str] | None = None) -> list[str]:
     """
     Collect all Python source files from the provided paths.
     If a path is a directory, it will be traversed recursively.
+
+    Returns absolute paths as plain strings: they pickle smaller than
+    Path objects when handed to pool workers.
     """
-    files: list[Path] = []
+    files: list[str] = []
+    seen: set[str] = set()
     excludes = list(excludes or [])
 
+    # Compile all exclude globs into a single regex union once, instead of
+    # re-running fnmatch per pattern for every file.
+    exclude_re = (
+        re.compile("|".join(f"(?:{fnmatch.translate(pat)})" for pat in excludes)) if excludes else None
+    )
+    rel_roots = [root for root in paths if root.is_dir()]
+
     def is_excluded(p: Path) -> bool:
-        if not excludes:
+        if exclude_re is None:
             return False
 
-        s = p.as_posix()
-        for pat in excludes:
-            # match against absolute path, basename, and path relative to any input root
-            if fnmatch.fnmatch(s, pat) or fnmatch.fnmatch(p.name, pat):
-                return True
-            for root in paths:
+        # match against absolute path, basename, and path relative to any input root
+        if exclude_re.match(p.name) or exclude_re.match(p.as_posix()):
+            return True
+        return any(
+            exclude_re.match(p.relative_to(root).as_posix()) for root in rel_roots if p.is_relative_to(root)
+        )
+
+    def add_file(p: Path) -> None:
+        if is_excluded(p):
+            return
+        # abspath is a pure string operation — unlike realpath it never
+        # issues readlink syscalls — and is enough to dedup overlapping
+        # input roots.
+        absolute = os.path.abspath(p)  # noqa: PTH100
+        if absolute not in seen:
+            seen.add(absolute)
+            files.append(absolute)
+
+    # Fan the walk out one task per top-level subdirectory; scandir releases
+    # the GIL, so threads overlap directory-read latency across subtrees.
+    futures: list[Future[list[str]]] = []
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for p in paths:
+            if p.is_file() and p.suffix == ".py":
+                add_file(p)
+            elif p.is_dir():
                 try:
-                    if root.is_dir() and p.is_relative_to(root):
-                        rel = p.relative_to(root).as_posix()
-                        if fnmatch.fnmatch(rel, pat):
-                            return True
-                except Exception:
+                    entries = list(os.scandir(os.fspath(p)))
+                except OSError as e:
+                    logger.warning(f"Error scanning {p}: {e}")
                     continue
-        return False
-
-    for p in paths:
-        if p.is_file() and p.suffix == ".py":
-            if not is_excluded(p):
-                files.append(p.resolve())
-        elif p.is_dir():
-            for f in p.rglob("*.py"):
-                if not is_excluded(f):
-                    files.append(f.resolve())
+                for entry in entries:
+                    if exclude_re is not None and exclude_re.match(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        futures.append(executor.submit(_walk_all, entry.path, exclude_re))
+                    elif entry.name.endswith(".py"):
+                        add_file(Path(entry.path))
+        for future in as_completed(futures):
+            for f in future.result():
+                add_file(Path(f))
 
     logger.debug(f"Collected {len(files)} Python files from {paths}")
     return files
@@ -87,7 +155,17 @@ def collect_py_files(paths: list[Path], excludes: Iterable[str] | None = None) -
     "-x",
     "excludes",
     multiple=True,
-    help="Exclude file patterns (glob). Can be passed multiple times.",
+    help=(
+        "Exclude file patterns (glob), matched against basenames, absolute paths, and paths "
+        "relative to the input roots. Directories whose name matches are pruned entirely. "
+        "Can be passed multiple times."
+    ),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Do not read or write the on-disk per-file import cache",
 )
 @click.option(
     "--verbose",
@@ -104,6 +182,7 @@ def main(
     pretty: bool,
     version_style: str,
     excludes: tuple[str, ...],
+    no_cache: bool,
     verbose: bool,
 ) -> None:
     logging.basicConfig(format="%(levelname)s: %(message)s")
@@ -125,15 +204,30 @@ def main(
                 raise click.BadParameter("--output must be a file, not a directory")
             fh = stack.enter_context(output.open("w", encoding="utf-8"))
 
-        with mp.Pool(jobs) as pool:
-            process_files(
-                pool,
-                real_paths,
-                output=fh,
-                output_format=output_format,
-                pretty=pretty,
-                version_style=version_style,
-            )
+        pool: PoolProtocol
+        if len(real_paths) <= PROCESS_POOL_THRESHOLD:
+            # Small scan: threads avoid process startup and argument
+            # pickling entirely; file I/O releases the GIL anyway.
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=jobs))
+        else:
+            # Prefer fork where available so workers inherit the preloaded
+            # PKG_MAP instead of rebuilding it during spawn-time module
+            # import.
+            if "fork" in mp.get_all_start_methods():
+                ctx = mp.get_context("fork")
+            else:
+                ctx = mp.get_context()
+            pool = stack.enter_context(ctx.Pool(jobs, initializer=_worker_init, initargs=(PKG_MAP,)))
+
+        process_files(
+            pool,
+            real_paths,
+            output=fh,
+            output_format=output_format,
+            pretty=pretty,
+            version_style=version_style,
+            cache_file=None if no_cache else _default_cache_file(),
+        )
 
 
 if __name__ == "__main__":
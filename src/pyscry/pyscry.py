@@ -1,28 +1,96 @@
 import ast
-import importlib
 import importlib.metadata as md
-import importlib.util
-import itertools
 import json
 import logging
+import multiprocessing as mp
+import os
+import re
 import sys
-import sysconfig
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
+from functools import cache
 from importlib.metadata import PackageNotFoundError
 from pathlib import Path
-from typing import Protocol, TextIO
+from typing import Any, Protocol, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import tree_sitter_python
+    from tree_sitter import Language, Parser, Query, QueryCursor
+
+    _TS_LANGUAGE = Language(tree_sitter_python.language())
+    _TS_PARSER = Parser(_TS_LANGUAGE)
+    # Captures cover plain, aliased, and from-imports; relative imports have
+    # a relative_import module_name and are deliberately not matched. Nor is
+    # future_import_statement: it can only name __future__, which the stdlib
+    # filter would drop anyway.
+    _TS_QUERY = Query(
+        _TS_LANGUAGE,
+        """
+        (import_statement name: (dotted_name) @module)
+        (import_statement name: (aliased_import name: (dotted_name) @module))
+        (import_from_statement module_name: (dotted_name) @module)
+        """,
+    )
+
+    def _find_imports_treesitter(source: bytes) -> set[str]:
+        """
+        Import discovery via tree-sitter: the C parser scans the file and
+        only the captured import names are materialized as Python objects,
+        so no full AST is ever built.
+        """
+        tree = _TS_PARSER.parse(source)
+        modules: set[str] = set()
+        for nodes in QueryCursor(_TS_QUERY).captures(tree.root_node).values():
+            for node in nodes:
+                name = source[node.start_byte : node.end_byte]
+                modules.add(name.partition(b".")[0].decode("utf-8", errors="replace"))
+        return modules
+
+    # Everything tree-sitter lives inside the try, so the parser and query
+    # are only ever referenced where they are known to be bound; the rest of
+    # the module checks this one handle instead.
+    _ts_find_imports: Callable[[bytes], set[str]] | None = _find_imports_treesitter
+except ImportError:
+    _ts_find_imports = None
 
 logger = logging.getLogger(__name__)
 
-# Preload the mapping once — huge speedup
-PKG_MAP = md.packages_distributions()
+# Preload the mapping once — huge speedup. Pool workers under spawn start
+# methods re-import this module; they skip the expensive build and receive
+# the parent's copy through _worker_init instead.
+PKG_MAP: Mapping[str, list[str]] = md.packages_distributions() if mp.parent_process() is None else {}
+
+
+def _worker_init(pkg_map: Mapping[str, list[str]]) -> None:
+    """
+    Pool initializer: adopt the parent's preloaded distribution mapping.
+    """
+    global PKG_MAP
+    PKG_MAP = pkg_map
+    # Cached lookups were keyed against the previous mapping.
+    module_to_distributions.cache_clear()
+
+
+# Import statements start a line (possibly indented) or follow a ':'/';' in a
+# compound statement. A file with no such match has nothing to parse.
+_IMPORT_RE = re.compile(rb"(?m)^[ \t]*(?:import|from)[ \t]|[;:][ \t]*(?:import|from)[ \t]")
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
 
 
 class PoolProtocol(Protocol):
+    # Structural common ground between multiprocessing.Pool and
+    # ThreadPoolExecutor: positional-only func/iterable (their parameter
+    # names differ), keyword-only chunksize, and an Iterable result (Pool
+    # returns a list, the executor a generator).
     def map[S, T](
-        self, func: Callable[[S], T], iterable: Iterable[S], chunksize: int | None = None
-    ) -> list[T]: ...
+        self, func: Callable[[S], T], iterable: Iterable[S], /, *, chunksize: int = 1
+    ) -> Iterable[T]: ...
 
 
 @dataclass(slots=True)
@@ -42,151 +110,295 @@ class Distribution:
         return f"{self.name}{op}{self.version}"
 
 
+class _ImportCollector(ast.NodeVisitor):
+    """
+    Visitor that records the top-level names of imported modules.
+    Dispatch happens only for the two import node types, avoiding
+    ast.walk's generator and per-node isinstance chain.
+    """
+
+    def __init__(self) -> None:
+        self.modules: set[str] = set()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.modules.add(alias.name.partition(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        # Relative imports are ignored.
+        if node.level == 0 and node.module:
+            self.modules.add(node.module.partition(".")[0])
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Import statements only occur in statement position, so recursion
+        # can be limited to statement blocks; expression subtrees — the bulk
+        # of most modules — are never descended into. The handlers and cases
+        # fields reach the bodies of except clauses and match arms.
+        for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+            children = getattr(node, field, None)
+            if children:
+                for child in children:
+                    self.visit(child)
+
+
 def find_imports(tree: ast.Module) -> set[str]:
     """
     Walk the AST to find all imported modules.
     Only top-level modules are collected.
     Relative imports are ignored.
     """
-    modules = set()
+    collector = _ImportCollector()
+    collector.visit(tree)
+    return collector.modules
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                modules.add(alias.name.split(".")[0])
-        elif isinstance(node, ast.ImportFrom):
-            if node.level > 0:
-                continue
-            if node.module:
-                modules.add(node.module.split(".")[0])
 
-    return modules
+@cache
+def _dist_version(dist: str) -> str | None:
+    """
+    Look up an installed distribution's version, or ``None`` if the
+    metadata is missing. Cached so each distribution's METADATA is read
+    at most once per process, however many modules it provides.
+    """
+    try:
+        return md.version(dist)
+    except PackageNotFoundError:
+        return None
 
 
+@cache
 def module_to_distributions(module_name: str) -> list[Distribution]:
     """
     Fast lookup using importlib.metadata.packages_distributions().
 
     Returns a list of `Distribution` objects (name + optional version).
     If no distribution provides the module an empty list is returned.
+    Results are memoized against the current ``PKG_MAP``; rebinding the
+    mapping must go through `_worker_init`, which drops the cache.
     """
     dists = PKG_MAP.get(module_name) or []
-    results: list[Distribution] = []
-    for dist in dists:
-        try:
-            version = md.version(dist)
-            results.append(Distribution(name=dist, version=version))
-        except PackageNotFoundError:
-            results.append(Distribution(name=dist))
-    return results
+    return [Distribution(name=dist, version=_dist_version(dist)) for dist in dists]
 
 
 def is_stdlib_module(module_name: str) -> bool:
     """
     Determine if a module is part of the Python standard library.
-    This is done by checking the module's origin against the standard library path.
+    Checks the interpreter's compiled-in module name tables, so no import
+    machinery runs and nothing is ever actually imported.
     """
-    # Fast path for builtin modules
-    if module_name in sys.builtin_module_names:
-        return True
+    return module_name in sys.builtin_module_names or module_name in sys.stdlib_module_names
 
-    try:
-        spec = importlib.util.find_spec(module_name)
-    except ValueError:
-        logger.warning(f"ValueError while finding spec for module {module_name}. Treating as stdlib.")
-        return True
-
-    if spec is None:
-        return False
-
-    origin = getattr(spec, "origin", None)
-    if origin in ("built-in", "frozen"):
-        return True
-
-    # Check against stdlib and platform stdlib paths
-    paths = sysconfig.get_paths()
-    stdlib_path = paths.get("stdlib")
-    platstdlib_path = paths.get("platstdlib")
-    stdlib_paths = [Path(p) for p in (stdlib_path, platstdlib_path) if p]
-
-    if origin:
-        try:
-            origin_path = Path(origin)
-            for sp in stdlib_paths:
-                try:
-                    origin_path.relative_to(sp)
-                    return True
-                except Exception:
-                    continue
-        except Exception:
-            pass
-
-    # Namespace packages may have no origin but have search locations
-    locations = getattr(spec, "submodule_search_locations", None)
-    if locations:
-        for loc in locations:
-            try:
-                loc_path = Path(loc)
-                for sp in stdlib_paths:
-                    try:
-                        loc_path.relative_to(sp)
-                        return True
-                    except Exception:
-                        continue
-            except Exception:
-                continue
-
-    return False
 
-
-def collect_imports_from_source(path: Path) -> set[str]:
+def collect_imports_from_source(path: str | Path) -> tuple[str, ...] | None:
     """
     Read a Python source file, parse it, and collect all imported modules.
+
+    Accepts a plain string path (preferred across the pool boundary) or a
+    Path. Returns a sorted tuple of unique module names; tuples of strings
+    pickle much smaller than sets, which matters when results cross the
+    pool's process boundary. Returns ``None`` when the file cannot be read
+    or parsed, so callers can tell failure apart from "no imports".
     """
     logger.debug(f"Collecting Imports... {path}")
 
     try:
-        source = path.read_text()
-        tree = ast.parse(source, filename=str(path))
-        return find_imports(tree)
+        # Unbuffered: the file is consumed in a single read, so BufferedReader
+        # would only add a copy. On POSIX, hint the kernel to read ahead.
+        # Builtin open, not Path.open: `path` is usually a plain string off
+        # the pool, and constructing a Path per file costs more than it buys.
+        with open(path, "rb", buffering=0) as f:  # noqa: PTH123
+            if _HAS_FADVISE:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            source = f.read()
+        # Cheap gates before the full parse: the substring scan rejects most
+        # files outright, the regex rejects ones that only mention "import"
+        # in comments or strings.
+        if b"import" not in source or _IMPORT_RE.search(source) is None:
+            return ()
+        if _ts_find_imports is not None:
+            return tuple(sorted(_ts_find_imports(source)))
+        # Hand the raw bytes to the C tokenizer so it handles encoding
+        # detection itself, avoiding a second decode pass here.
+        tree = ast.parse(
+            source, filename=str(path), type_comments=False, feature_version=sys.version_info[:2]
+        )
+        return tuple(sorted(find_imports(tree)))
     except SyntaxError as e:
         logger.warning(f"Syntax error in {path}: {e}")
-        return set()
+        return None
     except OSError as e:
         logger.warning(f"Error reading {path}: {e}")
-        return set()
+        return None
+
+
+def _file_size(path: str | Path) -> int:
+    # Sort key, called once per file: os.path.getsize stats a plain string
+    # directly, with no per-call Path allocation.
+    try:
+        return os.path.getsize(path)  # noqa: PTH202
+    except OSError:
+        return 0
+
+
+def _collect_with_path(path: str | Path) -> tuple[str, tuple[str, ...] | None]:
+    """
+    Worker wrapper that tags results with their path, for cache updates.
+    """
+    return os.fspath(path), collect_imports_from_source(path)
+
+
+def _load_import_cache(cache_file: Path) -> dict[str, Any]:
+    # Values are Any, not list: the file is foreign input, and under a
+    # mypyc-compiled build a narrower annotation is enforced at runtime,
+    # turning malformed entries into TypeErrors instead of cache misses.
+    try:
+        with cache_file.open(encoding="utf-8") as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_import_cache(cache_file: Path, cache: dict[str, Any]) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with cache_file.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"))
+    except OSError as e:
+        logger.warning(f"Failed to write import cache {cache_file}: {e}")
 
 
-def collect_imports(pool: PoolProtocol, paths: list[Path]) -> list[str]:
+def collect_imports(
+    pool: PoolProtocol,
+    paths: Sequence[str | Path],
+    chunksize: int | None = None,
+    cache_file: Path | None = None,
+) -> list[str]:
     """
     Collect imports from multiple source files using a multiprocessing pool.
+
+    Results are folded into one running set as workers finish. Pools that
+    support ``imap_unordered`` are used in streaming mode so large chunks
+    amortize IPC without buffering every per-file result. If `chunksize`
+    is ``None`` a batch size is derived from the pool's worker count.
+
+    If `cache_file` is given, per-file results are memoized on disk keyed
+    by size and mtime, so unchanged files are never re-parsed on later runs.
     """
-    results = pool.map(collect_imports_from_source, paths)
-    return sorted(set(itertools.chain.from_iterable(results)))
+    modules: set[str] = set()
+
+    cache: dict[str, Any] | None = None
+    stats: dict[str, tuple[int, int]] = {}
+    if cache_file is not None:
+        cache = _load_import_cache(cache_file)
+        pending: list[str | Path] = []
+        for path in paths:
+            key = os.fspath(path)
+            try:
+                # Paths are plain strings here; wrapping each in a Path just
+                # to stat it would allocate once per file.
+                st = os.stat(path)  # noqa: PTH116
+            except OSError:
+                pending.append(path)
+                continue
+            # Entries are [size, mtime_ns, modules]; tolerate foreign or
+            # malformed JSON by treating anything else as a miss.
+            entry = cache.get(key)
+            if (
+                isinstance(entry, list)
+                and len(entry) == 3
+                and entry[0] == st.st_size
+                and entry[1] == st.st_mtime_ns
+                and isinstance(entry[2], list)
+            ):
+                modules.update(entry[2])
+            else:
+                stats[key] = (st.st_size, st.st_mtime_ns)
+                pending.append(path)
+        logger.debug(f"Import cache: {len(paths) - len(pending)} hits, {len(pending)} misses")
+        paths = pending
+
+    # Largest files first (longest-processing-time scheduling): the slowest
+    # parses start early, so workers drain evenly instead of one of them
+    # drawing a huge file in the final chunk.
+    paths = sorted(paths, key=_file_size, reverse=True)
+
+    if chunksize is None:
+        workers: int = getattr(pool, "_processes", None) or os.cpu_count() or 1
+        chunksize = max(16, len(paths) // (workers * 8))
+
+    imap_unordered = getattr(pool, "imap_unordered", None)
+    if cache_file is None or cache is None:
+        if imap_unordered is not None:
+            results = imap_unordered(collect_imports_from_source, paths, chunksize)
+        else:
+            results = pool.map(collect_imports_from_source, paths, chunksize=chunksize)
+        for result in results:
+            if result:
+                modules.update(result)
+    else:
+        if imap_unordered is not None:
+            tagged = imap_unordered(_collect_with_path, paths, chunksize)
+        else:
+            tagged = pool.map(_collect_with_path, paths, chunksize=chunksize)
+        for key, mods in tagged:
+            # Failed reads/parses are not cached: the next run retries them
+            # instead of reporting the file as import-free forever.
+            if mods is None:
+                continue
+            modules.update(mods)
+            if key in stats:
+                size, mtime_ns = stats[key]
+                cache[key] = [size, mtime_ns, list(mods)]
+        _save_import_cache(cache_file, cache)
+
+    return sorted(modules)
 
 
 def process_files(
     pool: PoolProtocol,
-    paths: list[Path],
+    paths: Sequence[str | Path],
     output: TextIO | None = None,
     output_format: str = "text",
     pretty: bool = False,
     version_style: str = "minimum",
+    cache_file: Path | None = None,
 ) -> None:
     """
     Main processing function: collects imports and maps them to distributions.
 
     The `output` parameter may be a file-like object to write results to.
     If ``None`` the function writes to ``sys.stdout``.
+    `cache_file` optionally enables the on-disk per-file import cache.
     """
-    imports = collect_imports(pool, paths)
+    imports = collect_imports(pool, paths, cache_file=cache_file)
 
-    logger.debug("Mapping modules to distributions...")
-    mapped = pool.map(module_to_distributions, imports)
-    dist_map = dict(zip(imports, mapped, strict=True))
+    # Stdlib modules never resolve to a distribution; drop them up front so
+    # the mapping stage and unresolved bookkeeping only see real candidates.
+    imports = [module for module in imports if not is_stdlib_module(module)]
 
-    # Flatten and de-dupe distribution specifiers in deterministic order.
-    flattened = {info.to_specifier(version_style) for specs in dist_map.values() for info in specs}
+    logger.debug("Mapping modules to distributions...")
+    # Unique module counts are usually tiny, and the lookups are memoized;
+    # below this size the IPC round-trip costs more than the work itself.
+    mapped: Iterable[list[Distribution]]
+    if len(imports) < 1024:
+        mapped = list(map(module_to_distributions, imports))
+    else:
+        workers = getattr(pool, "_processes", None) or os.cpu_count() or 1
+        cs = max(32, len(imports) // workers)
+        mapped = pool.map(module_to_distributions, imports, chunksize=cs)
+    # Single pass over the mapping results: flatten and de-dupe resolved
+    # specifiers, and gather unresolved modules as they go by. `imports` is
+    # sorted, so the unresolved list comes out sorted too.
+    flattened: set[str] = set()
+    unresolved_modules: list[str] = []
+    for module, specs in zip(imports, mapped, strict=True):
+        if specs:
+            for info in specs:
+                flattened.add(info.to_specifier(version_style))
+        else:
+            unresolved_modules.append(module)
     dists = sorted(flattened)
 
     def create_writer() -> TextIO:
@@ -198,18 +410,21 @@ def process_files(
 
     match output_format:
         case "text":
-            for dist in dists:
-                writer.write(f"{dist}\n")
+            # One write, one syscall — not one per distribution.
+            if dists:
+                writer.write("\n".join(dists) + "\n")
         case "json":
             # Build unresolved mapping in deterministic order with sorted candidate lists
             unresolved: dict[str, list[str]] = {}
-            unresolved_modules = [m for m, d in dist_map.items() if (not is_stdlib_module(m) and not d)]
-            for module in sorted(unresolved_modules):
+            for module in unresolved_modules:
                 candidates = PKG_MAP.get(module) or []
                 unresolved[module] = sorted(candidates)
 
             payload = {"distributions": dists, "unresolved": unresolved}
-            if pretty:
+            if orjson is not None:
+                # Optional C-accelerated serializer; emits the same shape.
+                writer.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 if pretty else 0).decode())
+            elif pretty:
                 json.dump(payload, writer, indent=2, ensure_ascii=False)
             else:
                 json.dump(payload, writer, separators=(",", ":"), ensure_ascii=False)
@@ -217,7 +432,8 @@ def process_files(
         case _:
             raise ValueError(f"unsupported output_format: {output_format}")
 
-    for module, specs in dist_map.items():
-        if not is_stdlib_module(module):
-            if not specs:
-                logger.info(f"  {module} → (unresolved)")
+    # Reporting unresolved modules is informational only; skip the scan
+    # entirely when nobody is listening.
+    if logger.isEnabledFor(logging.INFO):
+        for module in unresolved_modules:
+            logger.info(f"  {module} → (unresolved)")
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from pyscry.__main__ import collect_py_files
+
+
+def test_collects_recursively_and_dedupes(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("import a\n")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "b.py").write_text("import b\n")
+    (tmp_path / "notes.txt").write_text("not python\n")
+
+    # `sub` is reachable through both roots; each file must appear once.
+    files = collect_py_files([tmp_path, sub])
+
+    assert sorted(Path(f).name for f in files) == ["a.py", "b.py"]
+
+
+def test_excluded_directories_are_pruned(tmp_path: Path) -> None:
+    build = tmp_path / "build"
+    build.mkdir()
+    (build / "generated.py").write_text("import generated\n")
+    (tmp_path / "keep.py").write_text("import keep\n")
+
+    # A pattern matching a directory name excludes everything beneath it.
+    files = collect_py_files([tmp_path], excludes=["build"])
+
+    assert [Path(f).name for f in files] == ["keep.py"]
+
+
+def test_exclude_glob_matches_basenames(tmp_path: Path) -> None:
+    (tmp_path / "keep.py").write_text("import keep\n")
+    (tmp_path / "skip_me.py").write_text("import skipped\n")
+
+    files = collect_py_files([tmp_path], excludes=["skip_*"])
+
+    assert [Path(f).name for f in files] == ["keep.py"]
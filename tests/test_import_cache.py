@@ -0,0 +1,77 @@
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from pyscry import pyscry
+
+
+class RecordingPool:
+    """
+    Serial pool that records every path dispatched to a worker, so tests
+    can assert which files were actually (re)parsed.
+    """
+
+    def __init__(self) -> None:
+        self.dispatched: list[str] = []
+
+    def map[S, T](
+        self, func: Callable[[S], T], iterable: Iterable[S], chunksize: int | None = None
+    ) -> list[T]:
+        _ = chunksize
+        items = list(iterable)
+        self.dispatched.extend(str(item) for item in items)
+        return [func(x) for x in items]
+
+
+def test_cache_hits_skip_reparsing(tmp_path: Path) -> None:
+    f = tmp_path / "mod.py"
+    f.write_text("import requests\n")
+    cache_file = tmp_path / "cache.json"
+
+    first = RecordingPool()
+    assert pyscry.collect_imports(first, [str(f)], cache_file=cache_file) == ["requests"]
+    assert first.dispatched == [str(f)]
+
+    # Unchanged file: the second run must serve it from the cache.
+    second = RecordingPool()
+    assert pyscry.collect_imports(second, [str(f)], cache_file=cache_file) == ["requests"]
+    assert second.dispatched == []
+
+
+def test_modified_files_are_reparsed(tmp_path: Path) -> None:
+    f = tmp_path / "mod.py"
+    f.write_text("import requests\n")
+    cache_file = tmp_path / "cache.json"
+
+    pyscry.collect_imports(RecordingPool(), [str(f)], cache_file=cache_file)
+
+    f.write_text("import flask\n")
+    pool = RecordingPool()
+    assert pyscry.collect_imports(pool, [str(f)], cache_file=cache_file) == ["flask"]
+    assert pool.dispatched == [str(f)]
+
+
+def test_failed_reads_are_not_cached(tmp_path: Path) -> None:
+    f = tmp_path / "vanishing.py"
+    cache_file = tmp_path / "cache.json"
+
+    pyscry.collect_imports(RecordingPool(), [str(f)], cache_file=cache_file)
+    # A file that could not be read must not get a cache entry: once it
+    # appears, the next run has to pick it up rather than trust the cache.
+    assert str(f) not in json.loads(cache_file.read_text())
+
+    f.write_text("import requests\n")
+    pool = RecordingPool()
+    assert pyscry.collect_imports(pool, [str(f)], cache_file=cache_file) == ["requests"]
+    assert pool.dispatched == [str(f)]
+
+
+def test_malformed_cache_entries_are_misses(tmp_path: Path) -> None:
+    f = tmp_path / "mod.py"
+    f.write_text("import requests\n")
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text(json.dumps({str(f): {"not": "a list"}, "other": [1]}))
+
+    pool = RecordingPool()
+    assert pyscry.collect_imports(pool, [str(f)], cache_file=cache_file) == ["requests"]
+    assert pool.dispatched == [str(f)]